@@ -1,15 +1,84 @@
 """This module provides ways of analyzingsolutions for edarop."""
-from typing import Dict
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import compress, groupby
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
 
 from .model import TimeUnit, TimeValue, Solution, Status, App
 
+_SEC = TimeUnit("s")
+
+
+@dataclass
+class ReqColumns:
+    """Stores the request allocations of all time slots of a solution as
+    parallel lists, with one element per (app, region, ic, time slot) entry.
+    The response time is stored in seconds and "missed" is True if it is
+    greater than the maximum response time of the app. Entries with 0
+    requests are not stored, but their apps are kept in "seen_apps", in order
+    of appearance, so that they can be reported with 0 requests."""
+
+    apps: List[App]
+    resp_times: List[float]
+    num_reqs: List[float]
+    missed: List[bool]
+    seen_apps: Dict[App, None]
+
 
 class SolutionAnalyzer:
     """This class carries out computations about cost and response time for
-    Solution objects."""
+    Solution objects. Solutions are not modified after being created, so the
+    results are computed the first time they are requested and then reused."""
 
     def __init__(self, sol: Solution):
         self.sol = sol
+        self._req_columns: Optional[ReqColumns] = None
+
+        # Cached results
+        self._cost: Optional[float] = None
+        self._avg_resp_time: Optional[TimeValue] = None
+        self._deadline_miss_rate: Optional[float] = None
+        self._per_app: Optional[Tuple[Dict[App, int], Dict[App, int]]] = None
+
+    def _reqs(self) -> ReqColumns:
+        """Returns the requests of all time slots as columns. They are built
+        the first time this method is called, walking the allocation once.
+        Entries with 0 requests are left out, since they do not contribute to
+        any metric, but their apps are recorded in "seen_apps"."""
+        if self._req_columns is None:
+            deadlines = self._deadlines_sec()
+            columns = ReqColumns(
+                apps=[], resp_times=[], num_reqs=[], missed=[], seen_apps={}
+            )
+
+            # Local names to avoid attribute lookups in the inner loop
+            resp_time_sec = self.sol.problem.system.resp_time_sec
+            add_app = columns.apps.append
+            add_resp_time = columns.resp_times.append
+            add_num_reqs = columns.num_reqs.append
+            add_missed = columns.missed.append
+            seen_apps = columns.seen_apps
+            for alloc in self.sol.alloc.time_slot_allocs:
+                for index, num_reqs in alloc.reqs.items():
+                    app, region, ic = index
+                    seen_apps[app] = None
+                    if num_reqs == 0:
+                        continue
+
+                    resp_time = resp_time_sec(app, region, ic)
+                    add_app(app)
+                    add_resp_time(resp_time)
+                    add_num_reqs(num_reqs)
+                    add_missed(resp_time > deadlines[app])
+
+            self._req_columns = columns
+
+        return self._req_columns
+
+    def _deadlines_sec(self) -> Dict[App, float]:
+        """Returns the maximum response time of each app in seconds."""
+        return {app: app.max_resp_time.to(_SEC) for app in self.sol.problem.system.apps}
 
     def cost(self) -> float:
         """Returns the cost of the allocation inside of the Solution. If the
@@ -20,14 +89,24 @@ class SolutionAnalyzer:
         ]:
             raise ValueError("Trying to get the cost of a non feasible solution")
 
+        if self._cost is not None:
+            return self._cost
+
+        # The price only depends on the instance class, so it is converted to
+        # the time slot unit once per instance class
+        ts_unit = self.sol.problem.time_slot_unit
+        ics = self.sol.problem.system.ics
+        unit_prices = {ic: ic.price.to(ts_unit) for ic in ics}
+
         cost = 0.0
-        for k in range(self.sol.problem.workload_len):
-            alloc = self.sol.alloc.time_slot_allocs[k]
+        for alloc in self.sol.alloc.time_slot_allocs:
             for index, num_vms in alloc.ics.items():
-                ic = index[1]
-                unit_price = ic.price.to(self.sol.problem.time_slot_unit)
-                cost += num_vms * unit_price
+                if num_vms == 0:
+                    continue
+
+                cost += num_vms * unit_prices[index[1]]
 
+        self._cost = cost
         return cost
 
     def avg_resp_time(self) -> TimeValue:
@@ -41,23 +120,22 @@ class SolutionAnalyzer:
                 "Trying to get the avg. resp. time of a non optimal solution"
             )
 
+        if self._avg_resp_time is not None:
+            return self._avg_resp_time
+
+        reqs = self._reqs()
         total_resp_time = 0.0
         total_reqs = 0
-        for k in range(self.sol.problem.workload_len):
-            alloc = self.sol.alloc.time_slot_allocs[k]
-            for index, num_reqs in alloc.reqs.items():
-                a, e, ic = index
-                req_resp_time = self.sol.problem.system.resp_time(
-                    app=a, region=e, ic=ic
-                )
-                total_resp_time += num_reqs * req_resp_time.to(TimeUnit("s"))
-
-                total_reqs += num_reqs
+        for resp_time, num_reqs in zip(reqs.resp_times, reqs.num_reqs):
+            total_resp_time += num_reqs * resp_time
+            total_reqs += num_reqs
 
         if total_reqs == 0:
-            return TimeValue(0, TimeUnit("s"))
+            self._avg_resp_time = TimeValue(0, _SEC)
+        else:
+            self._avg_resp_time = TimeValue(total_resp_time / total_reqs, _SEC)
 
-        return TimeValue(total_resp_time / total_reqs, TimeUnit(("s")))
+        return self._avg_resp_time
 
     def deadline_miss_rate(self) -> float:
         """Returns the deadline miss rate of the solution. If the solution is
@@ -70,69 +148,63 @@ class SolutionAnalyzer:
                 "Trying to get the deadline miss rate of a non optimal solution"
             )
 
-        total_missed_reqs = 0
-        total_reqs = 0
-        for k in range(self.sol.problem.workload_len):
-            alloc = self.sol.alloc.time_slot_allocs[k]
-            for index, num_reqs in alloc.reqs.items():
-                app, region, ic = index
-                req_resp_time = self.sol.problem.system.resp_time(
-                    app=app, region=region, ic=ic
-                )
-                if req_resp_time.to(TimeUnit("s")) > app.max_resp_time.to(
-                    TimeUnit("s")
-                ):
-                    total_missed_reqs += num_reqs
-
-                total_reqs += num_reqs
-
-        return total_missed_reqs / total_reqs
+        if self._deadline_miss_rate is None:
+            reqs = self._reqs()
+            total_missed_reqs = sum(compress(reqs.num_reqs, reqs.missed))
+            total_reqs = sum(reqs.num_reqs)
+            self._deadline_miss_rate = total_missed_reqs / total_reqs
+
+        return self._deadline_miss_rate
+
+    def _reqs_per_app(self) -> Tuple[Dict[App, int], Dict[App, int]]:
+        """Returns two dictionaries with the total number of requests and the
+        number of missed requests per application, computed in a single pass
+        over the allocation. The totals include every app that appears in the
+        allocation, with 0 if all its entries are 0, while the missed requests
+        only include apps with some request. The result is cached, so callers
+        must not modify the dictionaries."""
+        if self._per_app is not None:
+            return self._per_app
+
+        reqs = self._reqs()
+        total: Dict[App, int] = defaultdict(int, dict.fromkeys(reqs.seen_apps, 0))
+        missed: Dict[App, int] = defaultdict(int)
+
+        # The allocators generate the requests of each time slot grouped by
+        # app, so consecutive rows of the same app are added up in local
+        # variables and the dictionaries are only updated when the app changes
+        rows = zip(reqs.apps, reqs.num_reqs, reqs.missed)
+        for app, app_rows in groupby(rows, key=itemgetter(0)):
+            app_total = 0
+            app_missed = 0
+            for _, num_reqs, is_missed in app_rows:
+                app_total += num_reqs
+                if is_missed:
+                    app_missed += num_reqs
+
+            total[app] += app_total
+            missed[app] += app_missed
+
+        self._per_app = (dict(total), dict(missed))
+        return self._per_app
 
     def total_reqs_per_app(self) -> Dict[App, int]:
         """Returns the total number of requests per application."""
-        result = {}
-        for k in range(self.sol.problem.workload_len):
-            alloc = self.sol.alloc.time_slot_allocs[k]
-            for index, num_reqs in alloc.reqs.items():
-                app, _, _ = index
-                if app not in result:
-                    result[app] = 0
-
-                result[app] += num_reqs
-
-        return result
+        total, _ = self._reqs_per_app()
+        return dict(total)
 
     def total_missed_reqs_per_app(self) -> Dict[App, int]:
         """Returns the total number of missed requests per application."""
-        result = {}
-        for k in range(self.sol.problem.workload_len):
-            alloc = self.sol.alloc.time_slot_allocs[k]
-            for index, num_reqs in alloc.reqs.items():
-                if num_reqs == 0:
-                    continue  # No requests allocated, no missed requests
-
-                app, region, ic = index
-
-                if app not in result:
-                    result[app] = 0
-
-                req_resp_time_s = self.sol.problem.system.resp_time(
-                    app=app, region=region, ic=ic
-                ).to(TimeUnit("s"))
-                if req_resp_time_s > app.max_resp_time.to(TimeUnit("s")):
-                    result[app] += num_reqs
-
-        return result
+        _, missed = self._reqs_per_app()
+        return dict(missed)
 
     def miss_rate_per_app(self) -> Dict[App, float]:
-        """Returns the deadline miss rate per application."""
-        result = {}
-        miss_reqs_per_app = self.total_missed_reqs_per_app()
-        total_reqs_per_app = self.total_reqs_per_app()
-        for app in self.sol.problem.system.apps:
-            if app in miss_reqs_per_app:
-                result[app] = miss_reqs_per_app[app] / total_reqs_per_app[app]
-            else:
-                result[app] = 0.0
-
-        return result
+        """Returns the deadline miss rate per application. It is 0 for
+        applications without requests."""
+        total_reqs_per_app, miss_reqs_per_app = self._reqs_per_app()
+        return {
+            app: miss_reqs_per_app.get(app, 0) / total_reqs_per_app[app]
+            if total_reqs_per_app.get(app, 0)
+            else 0.0
+            for app in self.sol.problem.system.apps
+        }
@@ -10,17 +10,21 @@ All allocators receive an edarop problem and construct and solve the
 corresponding linear programming problem using pulp."""
 
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from dataclasses import dataclass
+import math
 import os
 import time
 import logging
-from typing import Dict, List, Any
-from functools import partial
+from typing import DefaultDict, Dict, List, Any, Optional, Tuple
+
+from typing_extensions import TypeAlias
 
 import pulp  # type: ignore
 from pulp import (  # type: ignore
     LpVariable,
-    lpSum,
+    LpAffineExpression,
+    LpConstraint,
     LpProblem,
     LpMinimize,
     value,
@@ -32,7 +36,13 @@ from pulp import (  # type: ignore
     devnull,
     log,
 )
-from pulp.constants import LpInteger, LpBinary  # type: ignore
+from pulp.constants import (  # type: ignore
+    LpInteger,
+    LpContinuous,
+    LpConstraintEQ,
+    LpConstraintGE,
+    PulpError,
+)
 
 from .model import (
     TimeUnit,
@@ -50,6 +60,12 @@ from .model import (
 
 from .analysis import SolutionAnalyzer
 
+_SEC = TimeUnit("s")
+
+# Type aliases for the keys of the variables
+XKey: TypeAlias = Tuple[App, InstanceClass, int]  # app, ic, time slot
+YKey: TypeAlias = Tuple[App, Region, InstanceClass, int]  # app, region, ic, time slot
+
 
 def pulp_to_edarop_status(
     pulp_problem_status: int, pulp_solution_status: int
@@ -76,7 +92,9 @@ def pulp_to_edarop_status(
 class XVarInfo:
     """Stores information about the app, instance class and time slot for an
     X variable. The price and performance is stored using as time unit one time
-    slot."""
+    slot. There is one per X variable, so __slots__ is used to save memory."""
+
+    __slots__ = ("app", "ic", "time_slot", "price_per_ts", "perf_per_ts")
 
     app: App
     ic: InstanceClass
@@ -88,7 +106,10 @@ class XVarInfo:
 @dataclass
 class YVarInfo:
     """Stores information about the app, region, instance class and time slot
-    for a Y variable."""
+    for a Y variable. There is one per Y variable, so __slots__ is used to save
+    memory."""
+
+    __slots__ = ("app", "region", "ic", "time_slot")
 
     app: App
     region: Region
@@ -100,36 +121,93 @@ class EdaropAllocator(ABC):
     """This abstract base class receives a problem of  optimization for an edge
     architecture and gives methods to solve it and store the solution."""
 
-    def __init__(self, problem: Problem):
+    def __init__(self, problem: Problem, integer: bool = True):
         """Constructor.
 
         Args:
-            problem: problem to solve."""
+            problem: problem to solve.
+            integer: if False, the number of VMs (X) and requests (Y) are
+                continuous variables. The problem is easier to solve and, for
+                large workloads, the solution is close to the integer one. The
+                number of VMs in the solution is rounded up."""
         self.problem = problem
+        self.integer = integer
         self.lp_problem = LpProblem("edarop_problem", LpMinimize)
 
-        self.x: LpVariable = LpVariable(name="X")  # Placeholders
-        self.x_names: List[str] = []
-        self.x_info: Dict[str, XVarInfo] = {}  # The string is the var name
-
-        self.y: LpVariable = LpVariable(name="Y")
-        self.y_names: List[str] = []
-        self.y_info: Dict[str, YVarInfo] = {}  # The string is the var name
-
-        self.z: LpVariable = LpVariable(name="Z")
-        self.z_names: List[str] = []
-
-    def solve(self, solver: Any = None) -> Solution:
+        self.time_slot_unit = problem.time_slot_unit
+
+        # The variables are keyed by tuples of model objects and the time slot.
+        # The names are only used by PuLP to write the problem for the solver
+        self.x: Dict[XKey, LpVariable] = {}
+        self.x_keys: List[XKey] = []
+        self.x_info: Dict[XKey, XVarInfo] = {}
+
+        self.y: Dict[YKey, LpVariable] = {}
+        self.y_keys: List[YKey] = []
+        self.y_info: Dict[YKey, YVarInfo] = {}
+
+        # Keys of the variables grouped as required by the constraints. They
+        # are filled when the variables are created
+        self.x_keys_app_timeslot: DefaultDict[
+            Tuple[App, int], List[XKey]
+        ] = defaultdict(list)
+        self.y_keys_app_ic_timeslot: DefaultDict[
+            Tuple[App, InstanceClass, int], List[YKey]
+        ] = defaultdict(list)
+        self.y_keys_app_region_timeslot: DefaultDict[
+            Tuple[App, Region, int], List[YKey]
+        ] = defaultdict(list)
+
+        # Instance classes that can serve requests from each region, in the
+        # same order as in the system
+        self.reachable_ics: Dict[Region, List[InstanceClass]] = {
+            e: [i for i in problem.system.ics if self._can_send_requests(e, i.region)]
+            for e in problem.regions
+        }
+
+        # Instance classes that can serve the requests of each app from each
+        # region within its response time requirement. The check does not
+        # depend on the time slot, so it is done once here. Y variables are
+        # only created for these instance classes, which enforces the response
+        # time requirement without binary variables or extra constraints
+        self.servable_ics: Dict[Tuple[App, Region], List[InstanceClass]] = {
+            (a, e): [
+                i for i in self.reachable_ics[e] if self._can_serve_in_time(a, e, i)
+            ]
+            for a in problem.system.apps
+            for e in problem.regions
+        }
+
+    def solve(
+        self, solver: Any = None, warm_start: Optional[Solution] = None
+    ) -> Solution:
         """Solve the linear programming problem and return the solution. A
         solver with options can be passed. For instance:
 
             from pulp import PULP_CBC_CMD
             solver = PULP_CBC_CMD(timeLimit=10, gapRel=0.01, threads=8, options=["preprocess off"])
+
+        Any other PuLP solver can be used. For many small problems, an
+        in-process solver such as pulp.HiGHS (it requires highspy) avoids
+        writing and reading the problem files that CBC needs in each call.
+        The lower bound of integer feasible solutions is only available with
+        CBC, because it is taken from its log.
+
+        If warm_start is given, the allocation in that solution is used as the
+        initial value of the variables. It must be a solution for a problem
+        with the same system. Its workload can be shorter, e.g., when the
+        problem is solved again after new time slots have been added to the
+        workload: the variables of the new time slots are left without an
+        initial value for the solver to complete. The solver only uses it if
+        it supports warm starts and it has been enabled, e.g., with
+        PULP_CBC_CMD(warmStart=True).
         """
         start_creation = time.perf_counter()
         self._create_vars()
         self._create_objective()
         self._create_contraints()
+        if warm_start is not None:
+            self._set_initial_values(warm_start)
         creation_time = time.perf_counter() - start_creation
 
         solving_stats = self.__solve_problem(solver, creation_time)
@@ -172,7 +250,8 @@ class EdaropAllocator(ABC):
             )
 
         if status == Status.INTEGER_FEASIBLE:
-            lower_bound = self.lp_problem.bestBound
+            # Only set by the patched CBC solver
+            lower_bound = getattr(self.lp_problem, "bestBound", None)
 
         solving_stats = SolvingStats(
             frac_gap=frac_gap,
@@ -188,46 +267,53 @@ class EdaropAllocator(ABC):
     @staticmethod
     def _aik_name(a: App, i: InstanceClass, k: int) -> str:
         """Returns the name for an X variable from the app, instance class and
-        time slot."""
+        time slot. It is only used to name the PuLP variable."""
         return f"{a.name}_{i.name}_{k}"
 
     @staticmethod
     def _aeik_name(a: App, e: Region, i: InstanceClass, k: int) -> str:
         """Returns the name for a Y or Z variable from the app, region, instance
-        class and time slot."""
+        class and time slot. It is only used to name the PuLP variable."""
         return f"{a.name}_{e.name}_{i.name}_{k}"
 
+    def _var_cat(self) -> str:
+        """Returns the PuLP category of the X and Y variables."""
+        return LpInteger if self.integer else LpContinuous
+
     def _create_vars_x(self):
         """Creates the X variables for the linear programming algorithm. Each
         X_aik variable represents the number of VMs for the app a of the
         instance class i at the time slot k."""
+        # The price and the performance do not depend on the time slot, so
+        # they are converted to the time slot unit only once
+        ts_unit = self.time_slot_unit
+        price_per_ts = {i: i.price.to(ts_unit) for i in self.problem.system.ics}
+
         for a in self.problem.system.apps:
             for i in self.problem.system.ics:
-                for k in range(self.problem.workload_len):
-                    if (a, i) not in self.problem.system.perfs.keys():
-                        # This instance class cannot run this app
-                        continue
-
-                    x_name = EdaropAllocator._aik_name(a, i, k)
-                    self.x_names.append(x_name)
-
-                    ts_unit = self.problem.time_slot_unit
+                if (a, i) not in self.problem.system.perfs:
+                    # This instance class cannot run this app
+                    continue
 
-                    perf = self.problem.system.perfs[a, i]
-                    perf_per_ts = perf.value.to(ts_unit)
+                perf = self.problem.system.perfs[a, i]
+                perf_per_ts = perf.value.to(ts_unit)
 
-                    price_per_ts = i.price.to(ts_unit)
-                    self.x_info[x_name] = XVarInfo(
+                for k in range(self.problem.workload_len):
+                    aik = (a, i, k)
+                    self.x_keys.append(aik)
+                    self.x_keys_app_timeslot[a, k].append(aik)
+                    self.x_info[aik] = XVarInfo(
                         app=a,
                         ic=i,
                         time_slot=k,
-                        price_per_ts=price_per_ts,
+                        price_per_ts=price_per_ts[i],
                         perf_per_ts=perf_per_ts,
                     )
-
-        self.x = LpVariable.dicts(
-            name="X", indices=self.x_names, lowBound=0, cat=LpInteger
-        )
+                    self.x[aik] = LpVariable(
+                        f"X_{EdaropAllocator._aik_name(a, i, k)}",
+                        lowBound=0,
+                        cat=self._var_cat(),
+                    )
 
     def _create_vars_y(self):
         """Creates the Y variables for the linear programming algorithm. Each
@@ -235,234 +321,226 @@ class EdaropAllocator(ABC):
         edge region e served by the instance class i in the time slot k."""
         for a in self.problem.system.apps:
             for e in self.problem.regions:
-                for i in self.problem.system.ics:
+                l_ae = self._workload_from_region(a, e)
+                for i in self.servable_ics[a, e]:
                     for k in range(self.problem.workload_len):
-                        if self._can_send_requests(e, i.region):
-                            y_name = EdaropAllocator._aeik_name(a, e, i, k)
-                            self.y_names.append(y_name)
-                            self.y_info[y_name] = YVarInfo(
-                                app=a, region=e, ic=i, time_slot=k
-                            )
-
-        self.y = LpVariable.dicts(
-            name="Y", indices=self.y_names, lowBound=0, cat=LpInteger
-        )
+                        if l_ae[k] == 0:
+                            # No requests come from this region, so Y_aeik
+                            # would always be 0
+                            continue
 
-    def _create_vars_z(self):
-        """Creates the Z variables for the linear programming algorithm. Each
-        Z_aeik is a binary variable. It is a indicator variable that is 0 if
-        Y_aeik is 0, or 1 if Y_aeik is greater than 0."""
-        for a in self.problem.system.apps:
-            for e in self.problem.regions:
-                for i in self.problem.system.ics:
-                    for k in range(self.problem.workload_len):
-                        if self._can_send_requests(e, i.region):
-                            z_name = EdaropAllocator._aeik_name(a, e, i, k)
-                            self.z_names.append(z_name)
+                        aeik = (a, e, i, k)
+                        self.y_keys.append(aeik)
+                        self.y_keys_app_ic_timeslot[a, i, k].append(aeik)
+                        self.y_keys_app_region_timeslot[a, e, k].append(aeik)
+                        self.y_info[aeik] = YVarInfo(
+                            app=a, region=e, ic=i, time_slot=k
+                        )
+                        self.y[aeik] = LpVariable(
+                            f"Y_{EdaropAllocator._aeik_name(a, e, i, k)}",
+                            lowBound=0,
+                            cat=self._var_cat(),
+                        )
+
+    def _can_serve_in_time(self, a: App, e: Region, i: InstanceClass) -> bool:
+        """Returns true if the instance class i can run the app a and the
+        response time for requests from the region e is equal to or less than
+        the response time requirement of the app. Otherwise, no requests can be
+        sent there, so no Y variables are created for them."""
+        if (a, i) not in self.problem.system.perfs:
+            return False
 
-        self.z = LpVariable.dicts(name="Z", indices=self.z_names, cat=LpBinary)
+        # "_lu" means in latency units
+        latency = self.problem.system.latencies[e, i.region]
+        slo_lu = self.problem.system.perfs[a, i].slo.to(latency.value.units)
+        max_resp_time_lu = a.max_resp_time.to(latency.value.units)
+        return latency.value.value + slo_lu <= max_resp_time_lu
 
     def _create_vars(self):
         """Creates the variables for the linear programming algorithm."""
         self._create_vars_x()
         self._create_vars_y()
-        self._create_vars_z()
 
         logging.info("There are %s X variables", len(self.x))
         logging.info("There are %s Y variables", len(self.y))
-        logging.info("There are %s Z variables", len(self.z))
 
     @abstractmethod
     def _create_objective(self):
         """Adds the function to optimize."""
 
-    def _is_x_app_and_timeslot(self, x_name: str, app: App, time_slot: int) -> bool:
-        """Returns true if a X variable name corresponds to an app and a
-        time slot."""
-        return (
-            self.x_info[x_name].app == app
-            and self.x_info[x_name].time_slot == time_slot
-        )
+    def _workload_from_region(self, a: App, e: Region) -> Tuple[float, ...]:
+        """Returns the workload for app a from region e at each time slot. It is
+        0 in all time slots if the app has no workload in the region."""
+        if (a, e) in self.problem.workloads:
+            return tuple(self.problem.workloads[(a, e)].values)
 
-    def _is_y_app_ic_and_timeslot(
-        self, y_name: str, app: App, ic: InstanceClass, time_slot: int
-    ) -> bool:
-        """Returns true if a Y variable name corresponds to an app, an instance
-        class and a time slot."""
-        return (
-            self.y_info[y_name].app == app
-            and self.y_info[y_name].ic == ic
-            and self.y_info[y_name].time_slot == time_slot
-        )
-
-    def _is_y_app_region_and_timeslot(
-        self, y_name: str, app: App, region: Region, time_slot: int
-    ) -> bool:
-        """Returns true if a Y variable name corresponds to an app, a region and
-        a time slot."""
-        return (
-            self.y_info[y_name].app == app
-            and self.y_info[y_name].region == region
-            and self.y_info[y_name].time_slot == time_slot
-        )
+        return (0,) * self.problem.workload_len
 
-    def _is_y_app_and_timeslot(self, y_name: str, app: App, time_slot: int) -> bool:
-        """Returns true if a Y variable name corresponds to an app and a time
-        slot."""
-        return (
-            self.y_info[y_name].app == app
-            and self.y_info[y_name].time_slot == time_slot
-        )
+    def _workload_per_app(self) -> Dict[App, List[float]]:
+        """Returns the workload for each app at each time slot for any region,
+        computed in a single pass over the workloads."""
+        result = {}
+        for a in self.problem.system.apps:
+            l_a = [0.0] * self.problem.workload_len
+            for r in self.problem.regions:
+                if (a, r) in self.problem.workloads:
+                    for k, l_aek in enumerate(self.problem.workloads[(a, r)].values):
+                        l_a[k] += l_aek
 
-    def _workload_for_app_in_time_slot(self, a: App, k: int) -> float:
-        """Returns the workload for app a at time slot k for any region."""
-        l_ak = 0.0
-        for r in self.problem.regions:
-            if (a, r) in self.problem.workloads:
-                l_ak += self.problem.workloads[(a, r)].values[k]
+            result[a] = l_a
 
-        return l_ak
+        return result
 
     def _create_contraints_throughput_per_app(self):
         """Adds throughput contraints per app and time slot: the performance
         of all the VMs for an app at a time slot has to be equal to or greater
         than the workload for that app at that time slot."""
+        constraints = []
+        workload_per_app = self._workload_per_app()
         for a in self.problem.system.apps:
             for k in range(self.problem.workload_len):
-                filter_app_and_timeslot = partial(
-                    self._is_x_app_and_timeslot, app=a, time_slot=k
-                )
-                x_names = filter(filter_app_and_timeslot, self.x_names)
-
-                l_ak = self._workload_for_app_in_time_slot(a=a, k=k)
-
-                self.lp_problem += (
-                    lpSum(
-                        self.x[x_name] * self.x_info[x_name].perf_per_ts
-                        for x_name in x_names
+                x_keys = self.x_keys_app_timeslot.get((a, k), [])
+
+                l_ak = workload_per_app[a][k]
+
+                # The constraints are built directly from (variable, coefficient)
+                # pairs, which avoids creating an intermediate expression for
+                # every term, as lpSum does, and for the comparison
+                constraints.append(
+                    LpConstraint(
+                        ((self.x[aik], self.x_info[aik].perf_per_ts) for aik in x_keys),
+                        sense=LpConstraintGE,
+                        rhs=l_ak,
+                        name=f"The performance of all VMs for app {a.name} has to"
+                        f" be equal to or greater than {l_ak}, the workload for"
+                        f" that app at time slot {k}",
                     )
-                    >= l_ak,
-                    f"The performance of all VMs for app {a.name} has to be equal to"
-                    f" or greater than {l_ak}, the workload for that app at"
-                    f" time slot {k}",
                 )
 
+        self._add_constraints(constraints)
+
     def _create_contraints_throughput_per_ic(self):
         """Adds throughput contraints per ic and time slot: the performance
         of an instance class has to be equal to or greater than the number of
         requests from any region assigned to it for all apps at any time
         slot."""
+        constraints = []
         for a in self.problem.system.apps:
             for i in self.problem.system.ics:
-                for k in range(self.problem.workload_len):
-                    if (a, i) not in self.problem.system.perfs:
-                        # This instance class cannot run this app
-                        continue
+                if (a, i) not in self.problem.system.perfs:
+                    # This instance class cannot run this app
+                    continue
 
-                    filter_app_ic_and_timeslot = partial(
-                        self._is_y_app_ic_and_timeslot, app=a, ic=i, time_slot=k
+                for k in range(self.problem.workload_len):
+                    y_keys = self.y_keys_app_ic_timeslot.get((a, i, k), [])
+
+                    # X_aik * perf - sum(Y_aeik) >= 0
+                    aik = (a, i, k)
+                    terms = [(self.x[aik], self.x_info[aik].perf_per_ts)]
+                    terms.extend((self.y[aeik], -1) for aeik in y_keys)
+
+                    constraints.append(
+                        LpConstraint(
+                            terms,
+                            sense=LpConstraintGE,
+                            rhs=0,
+                            name=f"The performance of ic {i.name} for app {a.name}"
+                            f" in time slot {k} has to be greater than or equal"
+                            f" to the number of requests assigned to it",
+                        )
                     )
-                    y_names = filter(filter_app_ic_and_timeslot, self.y_names)
-
-                    x_name = EdaropAllocator._aik_name(a, i, k)
 
-                    total_x_perf = self.x[x_name] * self.x_info[x_name].perf_per_ts
-
-                    self.lp_problem += (
-                        total_x_perf >= lpSum(self.y[y_name] for y_name in y_names),
-                        f"The performance of ic {i.name} for app {a.name}"
-                        f" in time slot {k} has to be greater than or equal"
-                        f" to the number of requests assigned to it",
-                    )
+        self._add_constraints(constraints)
 
     def _create_constraints_throughput_per_region(self):
         """Adds throughput contraints for each app, region and time slot: the
         sum of the requests processed comming from a region in any instance
         class has to be equal to the workload from that region at that time slot
         for that app."""
+        constraints = []
         for a in self.problem.system.apps:
             for e in self.problem.regions:
                 if (a, e) not in self.problem.workloads:
                     # Some apps might not have workload in a region
                     continue
 
+                if not self.reachable_ics[e]:
+                    # No instance class can receive requests from this region
+                    continue
+
                 for k in range(self.problem.workload_len):
                     l_aek = self.problem.workloads[(a, e)].values[k]
 
-                    filter_app_region_and_timeslot = partial(
-                        self._is_y_app_region_and_timeslot,
-                        app=a,
-                        region=e,
-                        time_slot=k,
-                    )
-                    y_names = list(filter(filter_app_region_and_timeslot, self.y_names))
-
-                    if not y_names:
+                    if l_aek == 0:
+                        # There are no Y variables to constrain
                         continue
 
-                    self.lp_problem += (
-                        lpSum(self.y[y_name] for y_name in y_names) == l_aek,
-                        f"The sum of requests for app {a.name} in time slot {k} from"
-                        f" region {e.name} has to be equal to the workload ({l_aek})",
+                    # If there are no Y variables, no reachable instance class
+                    # meets the response time requirement, so the constraint
+                    # makes the problem infeasible
+                    y_keys = self.y_keys_app_region_timeslot.get((a, e, k), [])
+
+                    constraints.append(
+                        LpConstraint(
+                            ((self.y[aeik], 1) for aeik in y_keys),
+                            sense=LpConstraintEQ,
+                            rhs=l_aek,
+                            name=f"The sum of requests for app {a.name} in time slot"
+                            f" {k} from region {e.name} has to be equal to the"
+                            f" workload ({l_aek})",
+                        )
                     )
 
-    def _create_contraints_response_time(self):
-        """If there are requests served from a region to an edge region e (i.e.,
-        if Y_aeik > 0), the response time (n_er_i + S_ia) has to be equal to or
-        less than the response time requirement (R_a)."""
-        M = 1_000_000_000  # Big number, greater than max Y_aeik
-        for a in self.problem.system.apps:
-            for e in self.problem.regions:
-                for i in self.problem.system.ics:
-                    for k in range(self.problem.workload_len):
-                        if not self._can_send_requests(e, i.region):
-                            continue
+        self._add_constraints(constraints)
 
-                        aeik_name = EdaropAllocator._aeik_name(a, e, i, k)
+    def _add_constraints(self, constraints: List[LpConstraint]) -> None:
+        """Adds a batch of constraints to the problem. Adding them in a batch
+        avoids the bookkeeping that PuLP does for each constraint added with
+        "+=", such as collecting its variables, which is done anyway when the
+        problem is written for the solver. Constraints without a name get one
+        generated by PuLP. As with "+=", it raises an exception if two
+        constraints have the same name, which can happen because PuLP replaces
+        some characters of the names, such as spaces and "-", with "_"."""
+        names = set(self.lp_problem.constraints)
+        for constraint in constraints:
+            name = constraint.name
+            if name is None:
+                continue
 
-                        self.lp_problem += self.y[aeik_name] <= M * self.z[aeik_name]
+            if name in names:
+                raise PulpError("overlapping constraint names: " + name)
 
-                        latency = self.problem.system.latencies[e, i.region]
+            names.add(name)
 
-                        # "_lu" means in latency units
-                        perf = self.problem.system.perfs[a, i]
-                        slo_lu = perf.slo.to(latency.value.units)
-
-                        max_resp_time_lu = a.max_resp_time.to(latency.value.units)
-
-                        self.lp_problem += (
-                            self.z[aeik_name] * (latency.value.value + slo_lu)
-                            <= max_resp_time_lu,
-                            f"The response time for app {a.name} from region"
-                            f" {e.name} to ic {i.name}"
-                            f" ({latency.value.value + slo_lu}) in time slot {k} has"
-                            f" to be equal to or less than R_a"
-                            f" ({max_resp_time_lu})",
-                        )
+        self.lp_problem.extend(constraints)
 
     def _create_contraints(self):
         """Adds the contraints."""
         self._create_contraints_throughput_per_app()
         self._create_contraints_throughput_per_ic()
         self._create_constraints_throughput_per_region()
-        self._create_contraints_response_time()
 
     def _can_send_requests(self, src: Region, dst: Region) -> bool:
         """Returns true if requests can be sent from src to dst. It assumes that
         if there is latency data, it is possible."""
         return (src, dst) in self.problem.system.latencies
 
-    def _calculate_resp_time_sec(self, y_name: str) -> float:
-        """Returns the response time in seconds for an app in an ic in a
-        region."""
-        e = self.y_info[y_name].region
-        ic = self.y_info[y_name].ic
-        app = self.y_info[y_name].app
+    def _total_cost_expr(self) -> LpAffineExpression:
+        """Returns the expression with the total cost of the VMs."""
+        return LpAffineExpression(
+            (self.x[aik], self.x_info[aik].price_per_ts) for aik in self.x_keys
+        )
 
-        resp_time = self.problem.system.resp_time(app=app, region=e, ic=ic).to(
-            TimeUnit("s")
+    def _total_resp_time_expr(self, scale: float = 1) -> LpAffineExpression:
+        """Returns the expression with the sum of the response times in seconds
+        of all the requests. The coefficients are multiplied by scale, which is
+        cheaper than multiplying or dividing the expression afterwards. The
+        response times are memoized by the system, so they are only computed
+        once for each app, region and instance class."""
+        resp_time_sec = self.problem.system.resp_time_sec
+        return LpAffineExpression(
+            (self.y[aeik], resp_time_sec(*aeik[:3]) * scale) for aeik in self.y_keys
         )
-        return resp_time * self.y[y_name]
 
     def _get_total_reqs(self) -> int:
         """Returns the total number of requests in the workload."""
@@ -473,16 +551,15 @@ class EdaropAllocator(ABC):
                     # Some apps might not have workload in a region
                     continue
 
-                for k in range(self.problem.workload_len):
-                    total_reqs += self.problem.workloads[(a, e)].values[k]
+                total_reqs += sum(self.problem.workloads[(a, e)].values)
 
         return total_reqs
 
-    def _get_valid_reqs(self, aeik_name: str) -> int:
+    def _get_valid_reqs(self, aeik: YKey) -> int:
         """Returns the number of requests for an app a from a region e in an ic
         i in a time slot k. It fixes a bug in the solver that returns a very
         small value for some variables."""
-        reqs = self.y[aeik_name].value()
+        reqs = self.y[aeik].value()
 
         if abs(reqs) < 1e-7:
             return 0  # This is a very small value, so we consider it 0
@@ -491,27 +568,65 @@ class EdaropAllocator(ABC):
             return reqs  # This is OK
 
         # This is a big negative value, so we raise an exception
-        raise ValueError(f"Invalid value for requests in {aeik_name}: {reqs}")
+        raise ValueError(f"Invalid value for requests in {self.y[aeik]}: {reqs}")
 
-    def _get_alloc(self, time_slot: int) -> TimeSlotAllocation:
-        """Returns the allocation for a time slot."""
-        ics = {}
-        reqs = {}
-        for a in self.problem.system.apps:
-            for i in self.problem.system.ics:
-                aik_name = EdaropAllocator._aik_name(a, i, time_slot)
-                if aik_name not in self.x:
-                    # Some instances might not be able to run an app
-                    continue
+    def _get_num_vms(self, aik: XKey) -> float:
+        """Returns the number of VMs for an app a in an ic i in a time slot k.
+        If the variables are continuous, the value is rounded up, ignoring
+        the small errors of the solver."""
+        num_vms = self.x[aik].value()
+        if self.integer:
+            return num_vms
 
-                ics[a, i] = self.x[aik_name].value()
+        return math.ceil(num_vms - 1e-7)
 
-                for r in self.problem.regions:
-                    if self._can_send_requests(r, i.region):
-                        aeik_name = EdaropAllocator._aeik_name(a, r, i, time_slot)
-                        reqs[a, r, i] = self._get_valid_reqs(aeik_name)
-
-        return TimeSlotAllocation(ics, reqs)
+    def _get_allocs(self) -> List[TimeSlotAllocation]:
+        """Returns the allocation for each time slot. It is built in a single
+        pass over the X variables, which are sorted by app, instance class and
+        time slot."""
+        # Regions that can send requests to each instance class
+        src_regions = {
+            i: [r for r in self.problem.regions if self._can_send_requests(r, i.region)]
+            for i in self.problem.system.ics
+        }
+
+        allocs = [
+            TimeSlotAllocation(ics={}, reqs={})
+            for _ in range(self.problem.workload_len)
+        ]
+        for aik in self.x_keys:
+            a, i, k = aik
+            alloc = allocs[k]
+            alloc.ics[a, i] = self._get_num_vms(aik)
+
+            for r in src_regions[i]:
+                aeik = (a, r, i, k)
+                if aeik in self.y:
+                    alloc.reqs[a, r, i] = self._get_valid_reqs(aeik)
+                else:
+                    alloc.reqs[a, r, i] = 0  # There is no workload from r
+
+        return allocs
+
+    def _set_initial_values(self, sol: Solution):
+        """Sets the initial value of the variables from the allocation in a
+        solution. Solutions without a feasible allocation are ignored. If the
+        solution has fewer time slots, the variables of the remaining time
+        slots are not given an initial value."""
+        if sol.solving_stats.status not in [Status.OPTIMAL, Status.INTEGER_FEASIBLE]:
+            return
+
+        allocs = sol.alloc.time_slot_allocs
+        for (a, i, k), var in self.x.items():
+            if k < len(allocs):
+                var.setInitialValue(allocs[k].ics.get((a, i), 0), check=False)
+
+        for aeik, var in self.y.items():
+            a, e, i, k = aeik
+            if k >= len(allocs):
+                continue
+
+            var.setInitialValue(allocs[k].reqs.get((a, e, i), 0), check=False)
 
     def _compose_solution(self, solving_stats: SolvingStats) -> Solution:
         self._log_solution()
@@ -519,28 +634,28 @@ class EdaropAllocator(ABC):
         if solving_stats.status not in [Status.OPTIMAL, Status.INTEGER_FEASIBLE]:
             alloc = Allocation(time_slot_allocs=[])
         else:
-            alloc = Allocation(
-                time_slot_allocs=[
-                    self._get_alloc(k) for k in range(self.problem.workload_len)
-                ]
-            )
+            alloc = Allocation(time_slot_allocs=self._get_allocs())
 
         return Solution(problem=self.problem, alloc=alloc, solving_stats=solving_stats)
 
     @staticmethod
-    def _log_var(variables: LpVariable):
+    def _log_var(variables: Dict[Any, LpVariable]):
         for var in variables.values():
-            if var.value() > 0:
-                logging.info("  %s = %i", var, var.value())
+            var_value = var.value()
+            if var_value > 0:
+                logging.info("  %s = %i", var, var_value)
 
         logging.info("")
 
     def _log_solution(self):
+        # Avoid walking all the variables if the messages would be discarded
+        if not logging.getLogger().isEnabledFor(logging.INFO):
+            return
+
         logging.info("Solution (only variables different to 0):")
 
         EdaropAllocator._log_var(self.x)
         EdaropAllocator._log_var(self.y)
-        EdaropAllocator._log_var(self.z)
 
         logging.info("Status: %s", LpStatus[self.lp_problem.status])
         logging.info("Objective: %f", value(self.lp_problem.objective))
@@ -552,17 +667,15 @@ class EdaropCAllocator(EdaropAllocator):
 
     def _create_objective(self):
         """Adds the cost function to optimize."""
-        self.lp_problem += lpSum(
-            self.x[x_name] * self.x_info[x_name].price_per_ts for x_name in self.x_names
-        )
+        self.lp_problem += self._total_cost_expr()
 
     def _create_constraint_max_avg_resp_time(self):
         """Creates a constraint for the maximum average response time."""
-        max_resp_time_sec = self.problem.max_avg_resp_time.to(TimeUnit("s"))
+        max_resp_time_sec = self.problem.max_avg_resp_time.to(_SEC)
+        # Both sides are multiplied by the total number of requests to avoid
+        # dividing the expression
         self.lp_problem += (
-            lpSum(self._calculate_resp_time_sec(y_name) for y_name in self.y_names)
-            / self._get_total_reqs()
-            <= max_resp_time_sec,
+            self._total_resp_time_expr() <= max_resp_time_sec * self._get_total_reqs(),
             f"Max. average response time has to be equal to or less than "
             f"{self.problem.max_avg_resp_time}",
         )
@@ -573,7 +686,7 @@ class EdaropCAllocator(EdaropAllocator):
         defined in the problem."""
         super()._create_contraints()
 
-        if self.problem.max_avg_resp_time != TimeValue(-1, TimeUnit("s")):
+        if self.problem.max_avg_resp_time != TimeValue(-1, _SEC):
             self._create_constraint_max_avg_resp_time()
 
 
@@ -584,10 +697,7 @@ class EdaropRAllocator(EdaropAllocator):
     def _create_objective(self):
         """Adds the response time function to optimize. It is the average
         response time."""
-        self.lp_problem += (
-            lpSum(self._calculate_resp_time_sec(y_name) for y_name in self.y_names)
-            / self._get_total_reqs()
-        )
+        self.lp_problem += self._total_resp_time_expr(scale=1 / self._get_total_reqs())
 
     def _create_contraints_cost(self):
         """The total cost must be less than the maximum cost."""
@@ -595,11 +705,7 @@ class EdaropRAllocator(EdaropAllocator):
             raise ValueError("The maximum cost in the problem is not initialized")
 
         self.lp_problem += (
-            lpSum(
-                self.x[x_name] * self.x_info[x_name].price_per_ts
-                for x_name in self.x_names
-            )
-            <= self.problem.max_cost,
+            self._total_cost_expr() <= self.problem.max_cost,
             f"Total cost has to be equal to or less than {self.problem.max_cost}",
         )
 
@@ -617,16 +723,22 @@ class EdaropCRAllocator:
     and, then, the minimum average response time is obtained for the cost
     previously computed."""
 
-    def __init__(self, problem: Problem):
+    def __init__(self, problem: Problem, integer: bool = True):
         """Constructor.
 
         Args:
-            problem: problem to solve."""
+            problem: problem to solve.
+            integer: if False, the number of VMs and requests are continuous
+                variables in both problems. See EdaropAllocator."""
         self.problem = problem
+        self.integer = integer
 
     def solve(self, solver: Any = None) -> Solution:
-        """Solve the linear programming problem and return the solution."""
-        edarop_c = EdaropCAllocator(self.problem)
+        """Solve the linear programming problem and return the solution. The
+        solution with the minimum cost is used as a warm start for the second
+        problem, because it is feasible for it. The solver only uses it if
+        warm starts are enabled, e.g., with PULP_CBC_CMD(warmStart=True)."""
+        edarop_c = EdaropCAllocator(self.problem, integer=self.integer)
         sol_c = edarop_c.solve(solver)
 
         optimal_cost = SolutionAnalyzer(sol_c).cost()
@@ -636,8 +748,8 @@ class EdaropCRAllocator:
             workloads=self.problem.workloads,
             max_cost=optimal_cost,
         )
-        edarop_r = EdaropRAllocator(new_problem)
-        sol_r = edarop_r.solve(solver)
+        edarop_r = EdaropRAllocator(new_problem, integer=self.integer)
+        sol_r = edarop_r.solve(solver, warm_start=sol_c)
 
         # Compose a new solution from sol_r but with the solving stats including
         # the creation and solving times of both sol_r and sol_c. The rest of
@@ -669,16 +781,22 @@ class EdaropRCAllocator:
     and, then, the minimum cost is obtained for the average response time
     previously computed."""
 
-    def __init__(self, problem: Problem):
+    def __init__(self, problem: Problem, integer: bool = True):
         """Constructor.
 
         Args:
-            problem: problem to solve."""
+            problem: problem to solve.
+            integer: if False, the number of VMs and requests are continuous
+                variables in both problems. See EdaropAllocator."""
         self.problem = problem
+        self.integer = integer
 
     def solve(self, solver: Any = None) -> Solution:
-        """Solve the linear programming problem and return the solution."""
-        edarop_r = EdaropRAllocator(self.problem)
+        """Solve the linear programming problem and return the solution. The
+        solution with the minimum average response time is used as a warm
+        start for the second problem. The solver only uses it if warm starts
+        are enabled, e.g., with PULP_CBC_CMD(warmStart=True)."""
+        edarop_r = EdaropRAllocator(self.problem, integer=self.integer)
         sol_r = edarop_r.solve(solver)
 
         optimal_resp_time = SolutionAnalyzer(sol_r).avg_resp_time()
@@ -689,8 +807,8 @@ class EdaropRCAllocator:
             max_cost=self.problem.max_cost,
             max_avg_resp_time=optimal_resp_time,
         )
-        edarop_c = EdaropCAllocator(new_problem)
-        sol_c = edarop_c.solve(solver)
+        edarop_c = EdaropCAllocator(new_problem, integer=self.integer)
+        sol_c = edarop_c.solve(solver, warm_start=sol_r)
 
         # Compose a new solution from sol_c but with the solving stats including
         # the creation and solving times of both sol_r and sol_c. The rest of
@@ -720,15 +838,40 @@ def _solve_CBC_patched(self, lp, use_mps=True):
     """Solve a MIP problem using CBC patched from original PuLP function
     to save a log with cbc's output and take from it the best bound."""
 
+    def last_line_starting_with(filename, prefix: bytes):
+        # The line is usually near the end of the log, so the file is read
+        # backwards in blocks and it stops at the first match
+        block_size = 8192
+        with open(filename, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            rest = b""  # Beginning of a line that started in the previous block
+            while pos > 0:
+                read_size = min(block_size, pos)
+                pos -= read_size
+                f.seek(pos)
+                lines = (f.read(read_size) + rest).split(b"\n")
+                rest = lines[0]
+                for l in reversed(lines[1:]):
+                    if l.startswith(prefix):
+                        return l.decode("utf8")
+            if rest.startswith(prefix):
+                return rest.decode("utf8")
+        return None
+
     def take_best_bound_from_log(filename, msg: bool):
         ret = None
         try:
-            with open(filename, "r", encoding="utf8") as f:
-                for l in f:
-                    if msg:
+            if msg:
+                # The whole log is printed, so it is read forwards
+                with open(filename, "r", encoding="utf8") as f:
+                    for l in f:
                         print(l, end="")
-                    if l.startswith("Lower bound:"):
-                        ret = float(l.split(":")[-1])
+                        if l.startswith("Lower bound:"):
+                            ret = float(l.split(":")[-1])
+            else:
+                l = last_line_starting_with(filename, b"Lower bound:")
+                if l is not None:
+                    ret = float(l.split(":")[-1])
         except:
             pass
         return ret
@@ -1,7 +1,8 @@
 """Classes for the model for edarop. Most of them are frozen data classes."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Tuple, List, Dict, Optional
 from typing_extensions import TypeAlias
 
@@ -26,6 +27,8 @@ class TimeUnit:
         "y": 365 * 24 * 60 * 60,
     }
 
+    __slots__ = ("unit", "amount")
+
     def __init__(self, unit: str, amount: float = 1) -> None:
         """Creates a TimeUnit for the given unit.
         Args:
@@ -48,18 +51,19 @@ class TimeUnit:
         Raises:
             ValueError if "to_unit" is not a known time unit.
         """
-        self.check_valid_unit(to_unit)
-        return (
-            self.amount
-            * self.conversion_factors[self.unit]
-            / self.conversion_factors[to_unit]
-        )
+        return self.amount * _conversion_factor(type(self), self.unit, to_unit)
 
     def __eq__(self, other):
-        return self.__dict__ == other.__dict__
+        if not isinstance(other, TimeUnit):
+            return NotImplemented
+
+        return self.unit == other.unit and self.amount == other.amount
 
     def __hash__(self):
-        return id(self)
+        # Equal time units must have the same hash so that they can be used
+        # as keys of caches, including the hash of frozen dataclasses such as
+        # TimeValue and App
+        return hash((self.unit, self.amount))
 
     def __repr__(self):
         return f"{self.amount} {self.unit}"
@@ -77,6 +81,16 @@ class TimeUnit:
             )
 
 
+@lru_cache(maxsize=None)
+def _conversion_factor(cls, from_unit: str, to_unit: str) -> float:
+    """Returns the factor to convert from_unit into to_unit using the conversion
+    factors of the TimeUnit class cls. There are only a few combinations, so
+    they are cached and the units are only validated the first time. Invalid
+    units raise ValueError, which is not cached."""
+    cls.check_valid_unit(to_unit)
+    return cls.conversion_factors[from_unit] / cls.conversion_factors[to_unit]
+
+
 @dataclass(frozen=True)
 class TimeValue:
     value: float
@@ -122,11 +136,20 @@ class App:
     name: str
     max_resp_time: TimeValue
 
+    def __hash__(self):
+        # Equal objects have the same name, and strings cache their hash, so
+        # this avoids hashing all the fields whenever this is used in a key
+        return hash(self.name)
+
 
 @dataclass(frozen=True)
 class Region:
     name: str
 
+    def __hash__(self):
+        # See App.__hash__()
+        return hash(self.name)
+
 
 @dataclass(frozen=True)
 class InstanceClass:
@@ -134,6 +157,10 @@ class InstanceClass:
     price: TimeRatioValue
     region: Region
 
+    def __hash__(self):
+        # See App.__hash__()
+        return hash(self.name)
+
 
 @dataclass(frozen=True)
 class Workload:
@@ -159,6 +186,14 @@ class System:
     perfs: Dict[Tuple[App, InstanceClass], Performance]
     latencies: Dict[Tuple[Region, Region], Latency]  # src, dst -> latency
 
+    # Cache for resp_time_sec()
+    _resp_time_sec_cache: Dict[Tuple[App, Region, InstanceClass], float] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    # Computed in __post_init__(). See the property regions
+    _regions: Tuple[Region, ...] = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
         self.__check_uniq_names(self.apps, "apps")
         self.__check_uniq_names(self.ics, "instance classes")
@@ -166,22 +201,44 @@ class System:
         regions = list(ic.region for ic in self.ics)
         self.__check_uniq_names(regions, "regions")
 
+        # Names are unique, so removing repeated regions keeps one object per
+        # region, in the order of the instance classes
+        object.__setattr__(self, "_regions", tuple(dict.fromkeys(regions)))
+
+    @property
+    def regions(self) -> Tuple[Region, ...]:
+        """Returns the regions of the instance classes without repetitions."""
+        return self._regions
+
     @staticmethod
     def __check_uniq_names(list_with_names, list_contents: str):
         """Checks that there are no two elements in a list that have the same
         field 'name' but are different objects."""
-        for i in range(len(list_with_names)):
-            for other in list_with_names[i + 1 :]:
-                one = list_with_names[i]
-                if one.name == other.name and id(one) != id(other):
-                    raise ValueError(f"Repeated name {other.name} in {list_contents}")
+        seen: Dict[str, object] = {}
+        for elem in list_with_names:
+            other = seen.setdefault(elem.name, elem)
+            if other is not elem:
+                raise ValueError(f"Repeated name {elem.name} in {list_contents}")
 
     def resp_time(self, app: App, region: Region, ic: InstanceClass) -> TimeValue:
         """Returns the response time for an app from a region using an instance
         class."""
-        slo = self.perfs[(app, ic)].slo.to(TimeUnit("s"))
-        latency = self.latencies[(region, ic.region)].value.to(TimeUnit("s"))
-        return TimeValue(slo + latency, TimeUnit("s"))
+        return TimeValue(self.resp_time_sec(app, region, ic), TimeUnit("s"))
+
+    def resp_time_sec(self, app: App, region: Region, ic: InstanceClass) -> float:
+        """Returns the response time in seconds for an app from a region using
+        an instance class as a plain float. It is cached, so perfs and
+        latencies must not be modified after creating the system."""
+        key = (app, region, ic)
+        resp_time = self._resp_time_sec_cache.get(key)
+        if resp_time is None:
+            sec = TimeUnit("s")
+            slo = self.perfs[(app, ic)].slo.to(sec)
+            latency = self.latencies[(region, ic.region)].value.to(sec)
+            resp_time = slo + latency
+            self._resp_time_sec_cache[key] = resp_time
+
+        return resp_time
 
 
 @dataclass(frozen=True)
@@ -191,10 +248,27 @@ class Problem:
     max_cost: float = -1
     max_avg_resp_time: TimeValue = TimeValue(-1, TimeUnit("s"))
 
+    # Computed in __post_init__(). See the properties with the same name
+    _regions: Tuple[Region, ...] = field(init=False, repr=False, compare=False)
+    _workload_len: Optional[int] = field(init=False, repr=False, compare=False)
+    _time_slot_unit: Optional[TimeUnit] = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
         self.__check_all_workloads_same_units()
         self.__check_all_workloads_same_len()
 
+        # The problem is frozen and these values are used in many loops, so
+        # they are computed only once
+        object.__setattr__(self, "_regions", self.__compute_regions())
+
+        a_workload = next(iter(self.workloads.values()), None)
+        if a_workload is None:
+            object.__setattr__(self, "_workload_len", None)
+            object.__setattr__(self, "_time_slot_unit", None)
+        else:
+            object.__setattr__(self, "_workload_len", len(a_workload.values))
+            object.__setattr__(self, "_time_slot_unit", a_workload.time_unit)
+
     def __check_all_workloads_same_units(self):
         if not self.workloads.values():
             return
@@ -217,29 +291,30 @@ class Problem:
     def workload_len(self) -> int:
         """Returns the workload length in number of time slots taking the length
         from a workload."""
-        a_workload = list(self.workloads.values())[0]
-        return len(a_workload.values)
+        if self._workload_len is None:
+            raise ValueError("The problem has no workloads")
+
+        return self._workload_len
 
     @property
     def regions(self) -> Tuple[Region, ...]:
         """Returns any region found in any instance class or workload."""
-        result = []
-        for ic in self.system.ics:
-            if ic.region not in result:
-                result.append(ic.region)
-
-        for wl_tuple in self.workloads.keys():
-            if wl_tuple[1] not in result:
-                result.append(wl_tuple[1])
+        return self._regions
 
+    def __compute_regions(self) -> Tuple[Region, ...]:
+        """Computes the regions returned by the property regions."""
+        result = dict.fromkeys(self.system.regions)
+        result.update(dict.fromkeys(region for _, region in self.workloads))
         return tuple(result)
 
     @property
     def time_slot_unit(self):
         """Returns the time units of the time slot, taking it from a
         workload."""
-        a_workload = list(self.workloads.values())[0]
-        return a_workload.time_unit
+        if self._time_slot_unit is None:
+            raise ValueError("The problem has no workloads")
+
+        return self._time_slot_unit
 
 
 @dataclass(frozen=True)
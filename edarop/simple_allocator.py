@@ -2,7 +2,7 @@
 """
 import time
 import math
-from typing import Dict, Tuple, List
+from typing import Dict, Iterable, Tuple, List, Optional
 
 from edarop.model import (
     TimeUnit,
@@ -36,6 +36,22 @@ class SimpleCostAllocator:
     def __init__(self, problem: Problem):
         self.problem = problem
 
+        # Performance of each app in each instance class in requests per time
+        # slot. See _perf_ts()
+        self._perfs_ts: Dict[Tuple[App, InstanceClass], float] = {}
+
+        # Instance class used by each app in each region. See _chosen_ic()
+        self._ic_chooser = InstanceChooser(problem)
+        self._chosen_ics: Dict[Tuple[App, Region], InstanceClass] = {}
+
+        # See _routes()
+        self._route_list: Optional[
+            List[Tuple[App, Region, InstanceClass, Tuple[int, ...]]]
+        ] = None
+
+        # See _wl_ic_app_series()
+        self._wl_series: Optional[Dict[Tuple[App, InstanceClass], List[int]]] = None
+
     def solve(self) -> Solution:
         """Allocates the cheapest instance class for each app in terms of
         performance per dolar. If there are multiple cheapest instance classes,
@@ -66,19 +82,74 @@ class SimpleCostAllocator:
         """Gets the allocation for a time slot."""
         wl_ic_app, reqs = self.compute_wl_ic_app(time_slot)
 
-        perfs = self.problem.system.perfs
-
         # number of ICs per instance class and app
         ics: Dict[Tuple[App, InstanceClass], int] = {}
         for (app, ic), wl in wl_ic_app.items():
-            ts_unit = self.problem.time_slot_unit
-            perf_ts = perfs[app, ic].value.to(ts_unit)
-
             if wl > 0:
-                ics[app, ic] = math.ceil(wl / perf_ts)
+                ics[app, ic] = math.ceil(wl / self._perf_ts(app, ic))
 
         return TimeSlotAllocation(ics=ics, reqs=reqs)
 
+    def _perf_ts(self, app: App, ic: InstanceClass) -> float:
+        """Returns the performance of an app in an instance class in requests
+        per time slot. It is the same in all time slots, so it is only
+        computed the first time."""
+        perf_ts = self._perfs_ts.get((app, ic))
+        if perf_ts is None:
+            ts_unit = self.problem.time_slot_unit
+            perf_ts = self.problem.system.perfs[app, ic].value.to(ts_unit)
+            self._perfs_ts[app, ic] = perf_ts
+
+        return perf_ts
+
+    def _chosen_ic(self, app: App, reg: Region) -> InstanceClass:
+        """Returns the instance class that serves the requests of an app from a
+        region. The choice does not depend on the time slot, so it is only
+        made the first time."""
+        ic = self._chosen_ics.get((app, reg))
+        if ic is None:
+            ic = self._ic_chooser.smallest_fastest_cheapest_ic(app, reg)
+            self._chosen_ics[app, reg] = ic
+
+        return ic
+
+    def _routes(self) -> List[Tuple[App, Region, InstanceClass, Tuple[int, ...]]]:
+        """Returns a list with the app, the region, the instance class chosen
+        for them and the workload values for each app and region with a
+        workload, in the order of the apps and the regions of the problem. It
+        is computed the first time and then reused for all the time slots."""
+        if self._route_list is None:
+            self._route_list = [
+                (
+                    app,
+                    reg,
+                    self._chosen_ic(app, reg),
+                    self.problem.workloads[app, reg].values,
+                )
+                for app in self.problem.system.apps
+                for reg in self.problem.regions
+                if (app, reg) in self.problem.workloads
+            ]
+
+        return self._route_list
+
+    def _wl_ic_app_series(self) -> Dict[Tuple[App, InstanceClass], List[int]]:
+        """Returns the workload for each app and instance class in each time
+        slot, adding the workload from all the regions that use it. It is
+        computed for all the time slots in a single pass over the routes the
+        first time and then reused."""
+        if self._wl_series is None:
+            self._wl_series = {}
+            for app, _, ic, values in self._routes():
+                wl_series = self._wl_series.get((app, ic))
+                if wl_series is None:
+                    self._wl_series[app, ic] = list(values)
+                else:
+                    for k, workload in enumerate(values):
+                        wl_series[k] += workload
+
+        return self._wl_series
+
     def compute_wl_ic_app(
         self, time_slot
     ) -> Tuple[
@@ -95,29 +166,15 @@ class SimpleCostAllocator:
 
         reqs: Dict[Tuple[App, Region, InstanceClass], int] = {}  # number of requests
 
-        # First, compute the instance classes that will be used by each app
-        # in each region and the workload they will have.
-        for app in self.problem.system.apps:
-            for reg in self.problem.regions:
-                # Warning: this assumes everything is per hour, i.e., the time
-                # slot size of the workload is 1 hour.
-                if (app, reg) not in self.problem.workloads:
-                    continue
-
-                workload = self.problem.workloads[app, reg].values[time_slot]
-
-                ic_chooser = InstanceChooser(self.problem)
-                ic = ic_chooser.smallest_fastest_cheapest_ic(app, reg)
-
-                if (app, ic) not in wl_ic_app:
-                    wl_ic_app[app, ic] = 0
-
-                wl_ic_app[app, ic] += workload
+        # The instance class of each app and region is the same in all the
+        # time slots, so only the workload has to be read for this time slot
+        for app_ic, wl_series in self._wl_ic_app_series().items():
+            wl_ic_app[app_ic] = wl_series[time_slot]
 
-                if (app, reg, ic) not in reqs:
-                    reqs[app, reg, ic] = 0
-
-                reqs[app, reg, ic] += workload
+        for app, reg, ic, values in self._routes():
+            # Warning: this assumes everything is per hour, i.e., the time
+            # slot size of the workload is 1 hour.
+            reqs[app, reg, ic] = values[time_slot]
 
         return wl_ic_app, reqs
 
@@ -128,6 +185,13 @@ class InstanceChooser:
     def __init__(self, problem: Problem):
         self.problem = problem
 
+        # Results of cheapest_ics() and fastest_ics(), which do not change for
+        # a problem
+        self._cheapest_ics: Dict[App, List[InstanceClass]] = {}
+        self._fastest_ics: Dict[
+            Tuple[Region, Tuple[InstanceClass, ...], App], List[InstanceClass]
+        ] = {}
+
     def smallest_fastest_cheapest_ic(self, app: App, src_reg: Region) -> InstanceClass:
         """Returns the cheapest instance class for an app. If there are
         multiple instances with the same perf/dolar, it returns the one with the
@@ -156,27 +220,55 @@ class InstanceChooser:
     ) -> List[InstanceClass]:
         """Returns a list of the ics with the lowest sum of network latency and
         server response time for an app from src_reg."""
-        latencies = self.problem.system.latencies
-        ic_resp_times = {}
-        for ic in ics:
-            if (src_reg, ic.region) in latencies:
-                ic_resp_times[ic] = self.response_time(src_reg, ic, app)
+        key = (src_reg, tuple(ics), app)
+        if key not in self._fastest_ics:
+            self._fastest_ics[key] = self._compute_fastest_ics(src_reg, ics, app)
 
-        min_resp_time = min(ic_resp_times.values())
-        return [
-            ic for ic, resp_time in ic_resp_times.items() if resp_time == min_resp_time
-        ]
+        return list(self._fastest_ics[key])
+
+    def _compute_fastest_ics(
+        self, src_reg: Region, ics: List[InstanceClass], app: App
+    ) -> List[InstanceClass]:
+        """Computes the result of fastest_ics()."""
+        latencies = self.problem.system.latencies
+        return _min_ics(
+            (ic, self.response_time(src_reg, ic, app))
+            for ic in ics
+            if (src_reg, ic.region) in latencies
+        )
 
     def cheapest_ics(self, app: App) -> List[InstanceClass]:
         """Returns the cheapest instance classes per request for an app."""
+        if app not in self._cheapest_ics:
+            self._cheapest_ics[app] = self._compute_cheapest_ics(app)
+
+        return list(self._cheapest_ics[app])
+
+    def _compute_cheapest_ics(self, app: App) -> List[InstanceClass]:
+        """Computes the result of cheapest_ics()."""
         ics = self.problem.system.ics
         perfs = self.problem.system.perfs
         hour = TimeUnit("h")
-        ic_dollar_per_req = {
-            ic: ic.price.to(hour) / perfs[app, ic].value.to(hour) for ic in ics
-        }
-
-        min_dolar_per_req = min(ic_dollar_per_req.values())
-        return [
-            ic for ic in ic_dollar_per_req if ic_dollar_per_req[ic] == min_dolar_per_req
-        ]
+        return _min_ics(
+            (ic, ic.price.to(hour) / perfs[app, ic].value.to(hour)) for ic in ics
+        )
+
+
+def _min_ics(ic_values: Iterable[Tuple[InstanceClass, float]]) -> List[InstanceClass]:
+    """Returns the instance classes with the minimum value, in the same order
+    as they are received, computed in a single pass. Values are compared
+    exactly, so ties are only found among identical values. Raises ValueError
+    if there are no instance classes."""
+    min_value = math.inf
+    result: List[InstanceClass] = []
+    for ic, ic_value in ic_values:
+        if not result or ic_value < min_value:
+            min_value = ic_value
+            result = [ic]
+        elif ic_value == min_value and ic not in result:
+            result.append(ic)
+
+    if not result:
+        raise ValueError("There are no instance classes to choose from")
+
+    return result
@@ -1,7 +1,8 @@
 """This module provides ways of visualizing problems and solutions for
 edarop."""
 
-from typing import Dict, List, Any, Tuple
+from collections import defaultdict
+from typing import DefaultDict, Dict, List, NamedTuple, Optional, Tuple
 
 from rich.console import Console
 from rich.table import Table
@@ -11,6 +12,18 @@ from .model import TimeUnit, TimeValue, Solution, InstanceClass, App, Status, Re
 
 from .analysis import SolutionAnalyzer
 
+# A row of a table, with the text of each cell
+Row = Tuple[str, ...]
+
+
+class RegionRow(NamedTuple):
+    """Values shown in a table for the requests from a region sent to an
+    instance class."""
+
+    region_name: str
+    num_reqs: int
+    avg_resp_time: float
+
 
 class SolutionPrettyPrinter:
     """Utilty methods to create pretty presentations of solutions."""
@@ -19,8 +32,72 @@ class SolutionPrettyPrinter:
         self.sol = sol
         self.console = Console()
 
-    def get_tables(self, detail_regions=True) -> List[Table]:
-        """Returns a list of tables, one for each application."""
+        # The analyzer caches its results, so the same one is always used. It
+        # is created the first time it is needed. See __analyzer()
+        self.__sol_analyzer: Optional[SolutionAnalyzer] = None
+
+        # See get_summary()
+        self.__summary: Optional[str] = None
+
+        # Allocation rows grouped for the tables. They are computed the first
+        # time they are needed. See __alloc_index()
+        self.__vms_per_app_ts: Optional[
+            DefaultDict[Tuple[App, int], List[Tuple[InstanceClass, int]]]
+        ] = None
+        self.__reqs_per_app_ic_ts: Optional[
+            DefaultDict[Tuple[App, InstanceClass, int], List[Tuple[Region, int]]]
+        ] = None
+
+        # See __table_rows()
+        self.__rows: Dict[Tuple[App, bool, bool], List[Optional[Row]]] = {}
+
+        # See __resp_time_sec()
+        self.__resp_times: Dict[Tuple[App, Region, InstanceClass], float] = {}
+
+    def __analyzer(self) -> SolutionAnalyzer:
+        """Returns the analyzer for the solution."""
+        if self.__sol_analyzer is None:
+            self.__sol_analyzer = SolutionAnalyzer(self.sol)
+
+        return self.__sol_analyzer
+
+    def __alloc_index(
+        self,
+    ) -> Tuple[
+        DefaultDict[Tuple[App, int], List[Tuple[InstanceClass, int]]],
+        DefaultDict[Tuple[App, InstanceClass, int], List[Tuple[Region, int]]],
+    ]:
+        """Returns two dictionaries with the allocation of all the time slots
+        grouped for the tables, built in a single pass over the allocation.
+        The first one has, for each app and time slot, the instance classes
+        with at least 1 VM and their number of VMs. The second one has, for
+        each app, instance class and time slot, the regions with requests sent
+        to the instance class and their number of requests."""
+        if self.__vms_per_app_ts is None or self.__reqs_per_app_ic_ts is None:
+            vms_per_app_ts: DefaultDict[
+                Tuple[App, int], List[Tuple[InstanceClass, int]]
+            ] = defaultdict(list)
+            reqs_per_app_ic_ts: DefaultDict[
+                Tuple[App, InstanceClass, int], List[Tuple[Region, int]]
+            ] = defaultdict(list)
+            for k, alloc in enumerate(self.sol.alloc.time_slot_allocs):
+                for (app, ic), num_vms in alloc.ics.items():
+                    if num_vms >= 1:
+                        vms_per_app_ts[app, k].append((ic, num_vms))
+
+                for (app, region, ic), num_reqs in alloc.reqs.items():
+                    if num_reqs != 0:
+                        reqs_per_app_ic_ts[app, ic, k].append((region, num_reqs))
+
+            self.__vms_per_app_ts = vms_per_app_ts
+            self.__reqs_per_app_ic_ts = reqs_per_app_ic_ts
+
+        return self.__vms_per_app_ts, self.__reqs_per_app_ic_ts
+
+    def get_tables(self, detail_regions=True, skip_empty_slots=False) -> List[Table]:
+        """Returns a list of tables, one for each application. If
+        skip_empty_slots is True, the time slots without VMs for the app are
+        not shown."""
         if self.sol.solving_stats.status not in [
             Status.OPTIMAL,
             Status.INTEGER_FEASIBLE,
@@ -28,18 +105,23 @@ class SolutionPrettyPrinter:
             return []
 
         return [
-            self.get_table_app(a, detail_regions) for a in self.sol.problem.system.apps
+            self.get_table_app(a, detail_regions, skip_empty_slots)
+            for a in self.sol.problem.system.apps
         ]
 
     def get_summary(self) -> str:
-        """Returns a summary of the solution."""
+        """Returns a summary of the solution. It is computed the first time
+        and then reused, since the solution does not change."""
         if self.sol.solving_stats.status not in [
             Status.OPTIMAL,
             Status.INTEGER_FEASIBLE,
         ]:
             return f"Non feasible solution. [bold red]{self.sol.solving_stats.status}"
 
-        sol_analyzer = SolutionAnalyzer(self.sol)
+        if self.__summary is not None:
+            return self.__summary
+
+        sol_analyzer = self.__analyzer()
         res = f"\nTotal cost: {sol_analyzer.cost()}"
 
         if self.sol.problem.max_cost != -1:
@@ -54,39 +136,65 @@ class SolutionPrettyPrinter:
         deadline_miss_rate = sol_analyzer.deadline_miss_rate()
         res += f"\nDeadline miss ratio: {deadline_miss_rate:.3f}"
 
+        self.__summary = res
         return res
 
-    def print(self, detail_regions=True):
+    def print(self, detail_regions=True, skip_empty_slots=False):
         """Prints a table for each application and a summary of the solution."""
-        tables = self.get_tables(detail_regions)
+        tables = self.get_tables(detail_regions, skip_empty_slots)
         for table in tables:
             print(table)
 
         print(self.get_summary())
 
-    def get_table_app(self, app: App, detail_regions=True) -> Table:
-        """Returns a Rich table with the solution for one a app."""
+    def get_table_app(
+        self, app: App, detail_regions=True, skip_empty_slots=False
+    ) -> Table:
+        """Returns a Rich table with the solution for one a app. If
+        skip_empty_slots is True, the time slots without VMs for the app are
+        not shown."""
         table = self.__create_alloc_table(app, detail_regions)
+        for row in self.__table_rows(app, detail_regions, skip_empty_slots):
+            if row is None:
+                table.add_section()
+            else:
+                table.add_row(*row)
+
+        return table
+
+    def __table_rows(
+        self, app: App, detail_regions: bool, skip_empty_slots: bool
+    ) -> List[Optional[Row]]:
+        """Returns the rows of the table for an app, with None where a section
+        ends. The solution does not change, so the rows of each table are
+        computed only once. A new Table is created for each call to
+        get_table_app(), so callers can modify it."""
+        key = (app, detail_regions, skip_empty_slots)
+        if key in self.__rows:
+            return self.__rows[key]
+
+        rows: List[Optional[Row]] = []
+
+        # The price of each instance class per time slot does not depend on
+        # the time slot, so it is converted only once
+        ts_unit = self.sol.problem.time_slot_unit
+        unit_prices = {ic: ic.price.to(ts_unit) for ic in self.sol.problem.system.ics}
+
+        vms_per_app_ts, reqs_per_app_ic_ts = self.__alloc_index()
 
         for k in range(self.sol.problem.workload_len):
-            alloc = self.sol.alloc.time_slot_allocs[k]
+            if skip_empty_slots and (app, k) not in vms_per_app_ts:
+                continue
 
             total_num_vms = 0
             total_cost = 0.0
             total_num_reqs = 0
             total_resp_time = 0.0
             first = True
-            for index, num_vms in alloc.ics.items():
-                alloc_app = index[0]
-
-                # Print a row only if it is for this app and it uses at least
-                # 1 VM
-                if alloc_app != app or num_vms < 1:
-                    continue
-
-                ic = index[1]
-                unit_price = ic.price.to(self.sol.problem.time_slot_unit)
-                cost = num_vms * unit_price
+            # There is a row only for the instance classes of this app that use
+            # at least 1 VM
+            for ic, num_vms in vms_per_app_ts.get((app, k), []):
+                cost = num_vms * unit_prices[ic]
 
                 total_num_vms += num_vms
                 total_cost += cost
@@ -97,48 +205,56 @@ class SolutionPrettyPrinter:
                 else:
                     time_slot = ""
 
-                table.add_row(time_slot, ic.name, str(int(num_vms)), f"{cost:.3f}")
+                rows.append((time_slot, ic.name, str(int(num_vms)), f"{cost:.3f}"))
 
                 if detail_regions:
-                    rows = self.__compute_region_rows(time_slot=k, app=app, ic=ic)
-                    for row in rows:
-                        table.add_row(
-                            "",
-                            f"  {row['region_name']}",
-                            "",
-                            "",
-                            f"{int(row['num_reqs']):_}",
-                            f"{row['avg_resp_time']:.3f}",
+                    region_reqs = reqs_per_app_ic_ts.get((app, ic, k), [])
+                    region_rows = self.__compute_region_rows(
+                        app=app, ic=ic, region_reqs=region_reqs
+                    )
+                    for row in region_rows:
+                        num_reqs = int(row.num_reqs)
+                        avg_resp_time = float(row.avg_resp_time)
+                        rows.append(
+                            (
+                                "",
+                                f"  {row.region_name}",
+                                "",
+                                "",
+                                f"{num_reqs:_}",
+                                f"{avg_resp_time:.3f}",
+                            )
                         )
 
-                        total_num_reqs += int(row["num_reqs"])
-                        total_resp_time += int(row["num_reqs"]) * float(
-                            row["avg_resp_time"]
-                        )
+                        total_num_reqs += num_reqs
+                        total_resp_time += num_reqs * avg_resp_time
 
-            table.add_section()
+            rows.append(None)
 
             if total_num_reqs > 0:
                 total_avg_resp_time = f"{total_resp_time/total_num_reqs:.5f}"
             else:
                 total_avg_resp_time = ""
 
-            table.add_row(
-                "total",
-                "",
-                str(int(total_num_vms)),
-                f"{total_cost:.2f}",
-                f"{total_num_reqs:_}",
-                total_avg_resp_time,
+            rows.append(
+                (
+                    "total",
+                    "",
+                    str(int(total_num_vms)),
+                    f"{total_cost:.2f}",
+                    f"{total_num_reqs:_}",
+                    total_avg_resp_time,
+                )
             )
 
-            table.add_section()
+            rows.append(None)
 
-        return table
+        self.__rows[key] = rows
+        return rows
 
-    def print_table_app(self, app: App, detail_regions=True):
+    def print_table_app(self, app: App, detail_regions=True, skip_empty_slots=False):
         """Prints a table with information about the allocation for an app."""
-        table = self.get_table_app(app, detail_regions)
+        table = self.get_table_app(app, detail_regions, skip_empty_slots)
         self.console.print(table)
 
     @staticmethod
@@ -159,34 +275,37 @@ class SolutionPrettyPrinter:
         return table
 
     def __compute_region_rows(
-        self, time_slot: int, app: App, ic: InstanceClass
-    ) -> List[Dict[str, Any]]:
+        self, app: App, ic: InstanceClass, region_reqs: List[Tuple[Region, int]]
+    ) -> List[RegionRow]:
         """Computes and returns a list of values that should be shown in each
         row for each region with the allocation for an app with an instance
-        class."""
+        class. region_reqs has the number of requests from each region sent
+        to the instance class."""
         rows = []
-        for index, num_reqs in self.sol.alloc.time_slot_allocs[time_slot].reqs.items():
-            alloc_app, region, alloc_ic = index
-            if app != alloc_app or ic != alloc_ic or num_reqs == 0:
-                continue
+        for region, num_reqs in region_reqs:
+            avg_resp_time = self.__resp_time_sec(app, region, ic)
+            rows.append(RegionRow(region.name, num_reqs, avg_resp_time))
 
+        return rows
+
+    def __resp_time_sec(self, app: App, region: Region, ic: InstanceClass) -> float:
+        """Returns the response time in seconds for an app from a region using
+        an instance class, or NaN if it cannot be computed. It is memoized,
+        including the NaN values, because the same tuple appears in many time
+        slots."""
+        key = (app, region, ic)
+        resp_time = self.__resp_times.get(key)
+        if resp_time is None:
             try:
-                avg_resp_time = self.sol.problem.system.resp_time(app, region, ic).to(
-                    TimeUnit("s")
-                )
+                resp_time = self.sol.problem.system.resp_time_sec(app, region, ic)
             except KeyError:
                 # This happens when there is no latency information between the
                 # source region and the ic region
-                avg_resp_time = float("NaN")
-            rows.append(
-                {
-                    "region_name": region.name,
-                    "num_reqs": num_reqs,
-                    "avg_resp_time": avg_resp_time,
-                }
-            )
+                resp_time = float("NaN")
 
-        return rows
+            self.__resp_times[key] = resp_time
+
+        return resp_time
 
 
 class ProblemPrettyPrinter:
@@ -210,11 +329,13 @@ class ProblemPrettyPrinter:
         table.add_column("Instance class")
         table.add_column("Price")
 
-        for region in self.problem.regions:
-            ics = [ic for ic in self.problem.system.ics if ic.region == region]
+        ics_per_region: DefaultDict[Region, List[InstanceClass]] = defaultdict(list)
+        for ic in self.problem.system.ics:
+            ics_per_region[ic.region].append(ic)
 
+        for region in self.problem.regions:
             first = True
-            for ic in ics:
+            for ic in ics_per_region.get(region, []):
                 if first:
                     region_name = region.name
                     first = False
@@ -282,19 +403,27 @@ class ProblemPrettyPrinter:
         for region in self.problem.regions:
             table.add_column(region.name)
 
-        latency_rows = []
-        for src in self.problem.regions:
-            row = [src.name]
-            for dst in self.problem.regions:
-                if (src, dst) not in self.problem.system.latencies:
-                    row.append("-")
-                else:
-                    latency = self.problem.system.latencies[(src, dst)]
-                    latency_ms = latency.value.to(TimeUnit("s")) * 1000
-                    row.append(f"{latency_ms:.2f}")
+        # The matrix of cells is filled in a single pass over the latencies.
+        # Pairs with regions that are not in the problem are not shown
+        regions = self.problem.regions
+        region_index = {region: i for i, region in enumerate(regions)}
+        cells = [["-"] * len(regions) for _ in regions]
+        has_latencies = [False] * len(regions)
+        sec = TimeUnit("s")
+        for (src, dst), latency in self.problem.system.latencies.items():
+            src_index = region_index.get(src)
+            dst_index = region_index.get(dst)
+            if src_index is None or dst_index is None:
+                continue
 
-            if not all(r == "-" for r in row[1:]):
-                latency_rows.append(row)
+            latency_ms = latency.value.to(sec) * 1000
+            cells[src_index][dst_index] = f"{latency_ms:.2f}"
+            has_latencies[src_index] = True
+
+        # Regions without latencies to any region are not shown
+        latency_rows = [
+            [src.name] + cells[i] for i, src in enumerate(regions) if has_latencies[i]
+        ]
 
         for latency in latency_rows:
             table.add_row(*latency)
@@ -3,6 +3,7 @@
 """Tests for `edarop` module."""
 import pytest
 from click.testing import CliRunner
+from pulp import PULP_CBC_CMD, PulpError  # type: ignore
 
 from edarop import cli
 from edarop.model import (
@@ -84,6 +85,84 @@ class TestEdaropBasic:
         assert SolutionAnalyzer(sol).deadline_miss_rate() == 0
         SolutionPrettyPrinter(sol).print(detail_regions=True)
 
+    def test_edarop_c_basic_continuous(self):
+        """Test a simple cost optimization problem with continuous variables.
+        The number of VMs is rounded up."""
+        self.__set_up(slo_sec=0.15)
+        self.workloads = {
+            key: Workload(values=(9, 19), time_unit=wl.time_unit)
+            for key, wl in self.workloads.items()
+        }
+        problem = Problem(system=self.system, workloads=self.workloads)
+        allocator = EdaropCAllocator(problem, integer=False)
+        sol = allocator.solve()
+        assert sol.solving_stats.status == Status.OPTIMAL
+        num_vms = [list(ts.ics.values()) for ts in sol.alloc.time_slot_allocs]
+        assert num_vms == [[2], [4]]
+        assert SolutionAnalyzer(sol).cost() == pytest.approx(0.2 + 0.4)
+
+    def test_edarop_c_basic_warm_start_shorter_workload(self):
+        """Test that a solution for the first time slot can be used as a warm
+        start for the problem with all the time slots."""
+        self.__set_up(slo_sec=0.15)
+        first_ts_workloads = {
+            key: Workload(values=wl.values[:1], time_unit=wl.time_unit)
+            for key, wl in self.workloads.items()
+        }
+        first_ts_problem = Problem(system=self.system, workloads=first_ts_workloads)
+        first_ts_sol = EdaropCAllocator(first_ts_problem).solve()
+        assert first_ts_sol.solving_stats.status == Status.OPTIMAL
+
+        problem = Problem(system=self.system, workloads=self.workloads)
+        solver = PULP_CBC_CMD(warmStart=True)
+        sol = EdaropCAllocator(problem).solve(solver, warm_start=first_ts_sol)
+        assert SolutionAnalyzer(sol).cost() == 0.2 + 0.4
+        assert sol.solving_stats.status == Status.OPTIMAL
+
+    def test_edarop_c_basic_unreachable_region(self):
+        """Test that the workload from a region without latency information to
+        any instance class does not make the problem infeasible. It is still
+        included in the workload of the app."""
+        self.__set_up(slo_sec=0.15)
+        app = self.system.apps[0]
+        self.workloads[app, Region("unreachable")] = Workload(
+            values=(3, 0),
+            time_unit=TimeUnit("h"),
+        )
+        problem = Problem(system=self.system, workloads=self.workloads)
+        sol = EdaropCAllocator(problem).solve()
+        assert sol.solving_stats.status == Status.OPTIMAL
+        num_vms = [list(ts.ics.values()) for ts in sol.alloc.time_slot_allocs]
+        assert num_vms == [[3], [4]]
+
+    def test_edarop_c_basic_overlapping_constraint_names(self):
+        """Test that region names that are equal after PuLP replaces some of
+        their characters raise an exception instead of overwriting a
+        constraint."""
+        self.__set_up(slo_sec=0.15)
+        app = self.system.apps[0]
+        region_ireland = self.system.ics[0].region
+        latencies = dict(self.system.latencies)
+        for name in ("edge-1", "edge 1"):
+            region = Region(name)
+            latencies[region, region_ireland] = Latency(
+                TimeValue(0.05, TimeUnit("s")),
+            )
+            self.workloads[app, region] = Workload(
+                values=(10, 20),
+                time_unit=TimeUnit("h"),
+            )
+
+        system = System(
+            apps=self.system.apps,
+            ics=self.system.ics,
+            perfs=self.system.perfs,
+            latencies=latencies,
+        )
+        problem = Problem(system=system, workloads=self.workloads)
+        with pytest.raises(PulpError, match="overlapping constraint names"):
+            EdaropCAllocator(problem).solve()
+
     def test_edarop_c_basic_infeasible(self):
         """This is equal to the basic test, but it is infeasible because of the
         latency."""
@@ -400,6 +479,76 @@ class TestEdarop2CloudRegions2EdgeRegions2Apps:
         assert sol.solving_stats.status == Status.OPTIMAL
         SolutionPrettyPrinter(sol).print(detail_regions=True)
 
+    @staticmethod
+    def __assert_initial_values(allocator, sol):
+        """Asserts that the X variables of the allocator have as initial value
+        the number of VMs in the allocation of sol. At least one of them has
+        to be greater than 0."""
+        num_checked = 0
+        for k, alloc in enumerate(sol.alloc.time_slot_allocs):
+            for (app, ic), num_vms in alloc.ics.items():
+                assert allocator.x[app, ic, k].varValue == num_vms
+                if num_vms > 0:
+                    num_checked += 1
+
+        assert num_checked > 0
+
+    def test_cr_2CloudRegions2EdgeRegions2Apps_warm_start(self):
+        """Test that using the first solution as a warm start for the second
+        problem gives the same cost as without warm start."""
+        self.__set_up()
+        problem = Problem(system=self.system, workloads=self.workloads)
+        solver = PULP_CBC_CMD(warmStart=True)
+        sol = EdaropCRAllocator(problem).solve(solver)
+
+        assert sol.solving_stats.status == Status.OPTIMAL
+        assert SolutionAnalyzer(sol).cost() == pytest.approx(
+            (
+                (6 * 0.214 + 7 * 0.214 + (9 * 0.214) + 0 + 2 * 1.65 + 1.65)
+                + (3 * 0.214 + 1 * 0.214 + 1 * 0.214 + 0 + 1 * 0.856 + 0)
+            )
+        )
+
+        # The solution of the first problem is loaded into the variables of
+        # the second one before solving it
+        sol_c = EdaropCAllocator(problem).solve(solver)
+        problem_r = Problem(
+            system=self.system,
+            workloads=self.workloads,
+            max_cost=SolutionAnalyzer(sol_c).cost(),
+        )
+        edarop_r = EdaropRAllocator(problem_r)
+        edarop_r._create_vars()
+        edarop_r._set_initial_values(sol_c)
+        self.__assert_initial_values(edarop_r, sol_c)
+
+    def test_rc_2CloudRegions2EdgeRegions2Apps_warm_start(self):
+        """Test that using the first solution as a warm start for the second
+        problem gives the same average response time as without warm start."""
+        self.__set_up()
+        problem = Problem(system=self.system, workloads=self.workloads, max_cost=100)
+        solver = PULP_CBC_CMD(warmStart=True)
+        sol = EdaropRCAllocator(problem).solve(solver)
+
+        assert sol.solving_stats.status == Status.OPTIMAL
+        assert SolutionAnalyzer(sol).avg_resp_time().value == pytest.approx(
+            0.1455567881140945
+        )
+
+        # The solution of the first problem is loaded into the variables of
+        # the second one before solving it
+        sol_r = EdaropRAllocator(problem).solve(solver)
+        problem_c = Problem(
+            system=self.system,
+            workloads=self.workloads,
+            max_cost=problem.max_cost,
+            max_avg_resp_time=SolutionAnalyzer(sol_r).avg_resp_time(),
+        )
+        edarop_c = EdaropCAllocator(problem_c)
+        edarop_c._create_vars()
+        edarop_c._set_initial_values(sol_r)
+        self.__assert_initial_values(edarop_c, sol_r)
+
 
 class TestOneCloudRegionTwoEdge:
     """Tests with only one cloud region and two edge regions and one app. It is
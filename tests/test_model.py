@@ -44,6 +44,35 @@ class TestModel:
         rpm = rps.to(TimeUnit("m"))
         assert rpm == 60
 
+    def test_time_unit_invalid_to_unit(self):
+        """Test that converting to an invalid unit raises ValueError every
+        time, even if the conversion factors are cached."""
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                TimeUnit("h").to("weeks")
+
+    def test_time_unit_subclass(self):
+        """Test that a subclass uses its own conversion factors."""
+
+        class TimeUnitWithWeeks(TimeUnit):
+            conversion_factors = {**TimeUnit.conversion_factors, "w": 7 * 24 * 3600}
+
+        assert TimeUnitWithWeeks("w").to("d") == 7
+        with pytest.raises(ValueError):
+            TimeUnit("h").to("w")
+
+    def test_time_unit_eq_hash(self):
+        """Test that equal time units have the same hash, so they can be used
+        as keys, also inside frozen dataclasses."""
+        assert TimeUnit("s") == TimeUnit("s")
+        assert TimeUnit("s") != TimeUnit("s", amount=2)
+        assert TimeUnit("s") != "s"
+        assert len({TimeUnit("h"), TimeUnit("h")}) == 1
+
+        a0 = App("a0", max_resp_time=TimeValue(0.2, TimeUnit("s")))
+        a0_copy = App("a0", max_resp_time=TimeValue(0.2, TimeUnit("s")))
+        assert {a0: 1}[a0_copy] == 1
+
     def test_get_regions(self):
         """Test that Problem.regions combines the regions found in the instance
         classes with the ones found in the workload."""
@@ -1,8 +1,18 @@
 """Tests for `simple_allocator` module."""
+import copy
 from typing import Dict, Tuple
 import pytest
 
-from edarop.model import Problem, System, Workload, App, Region, TimeValue, TimeUnit
+from edarop.model import (
+    Problem,
+    System,
+    Workload,
+    App,
+    Region,
+    TimeValue,
+    TimeUnit,
+    Solution,
+)
 from edarop.analysis import SolutionAnalyzer
 from edarop.visualization import SolutionPrettyPrinter, ProblemPrettyPrinter
 from edarop.simple_allocator import SimpleCostAllocator
@@ -45,6 +55,71 @@ class TestSimpleCostAllocator:
             assert miss_rate_per_app[sol.problem.system.apps[0]] == pytest.approx(1)
             assert miss_rate_per_app[sol.problem.system.apps[1]] == pytest.approx(0)
 
+    @pytest.mark.parametrize("system_wl_four_two_apps", [0.2], indirect=True)
+    def test_analyzer_copied_alloc(
+        self, system_wl_four_two_apps: Tuple[System, Dict[Tuple[App, Region], Workload]]
+    ):
+        """Test that the analyzer gives the same results for an allocation
+        whose model objects are equal but not the same as the ones in the
+        problem."""
+        system, workloads = system_wl_four_two_apps
+        problem = Problem(system=system, workloads=workloads)
+        sol = SimpleCostAllocator(problem=problem).solve()
+        sol_copy = Solution(
+            problem=problem,
+            alloc=copy.deepcopy(sol.alloc),
+            solving_stats=sol.solving_stats,
+        )
+
+        sol_analyzer = SolutionAnalyzer(sol)
+        copy_analyzer = SolutionAnalyzer(sol_copy)
+        assert copy_analyzer.cost() == sol_analyzer.cost()
+        assert copy_analyzer.avg_resp_time() == sol_analyzer.avg_resp_time()
+        assert copy_analyzer.deadline_miss_rate() == sol_analyzer.deadline_miss_rate()
+
+    @pytest.mark.parametrize("system_wl_four_two_apps", [0.2], indirect=True)
+    def test_analyzer_app_without_reqs(
+        self, system_wl_four_two_apps: Tuple[System, Dict[Tuple[App, Region], Workload]]
+    ):
+        """Test that an app whose requests are all 0 in the allocation is
+        reported with 0 total requests."""
+        system, workloads = system_wl_four_two_apps
+        problem = Problem(system=system, workloads=workloads)
+        sol = SimpleCostAllocator(problem=problem).solve()
+
+        app = system.apps[1]
+        alloc = copy.deepcopy(sol.alloc)
+        for ts_alloc in alloc.time_slot_allocs:
+            for index in ts_alloc.reqs:
+                if index[0] == app:
+                    ts_alloc.reqs[index] = 0
+
+        sol_analyzer = SolutionAnalyzer(
+            Solution(problem=problem, alloc=alloc, solving_stats=sol.solving_stats)
+        )
+        assert sol_analyzer.total_reqs_per_app()[app] == 0
+        assert sol_analyzer.miss_rate_per_app()[app] == 0.0
+
+    @pytest.mark.parametrize("system_wl_four_two_apps", [0.2], indirect=True)
+    def test_skip_empty_slots(
+        self, system_wl_four_two_apps: Tuple[System, Dict[Tuple[App, Region], Workload]]
+    ):
+        """Test that the time slots without VMs for an app are only left out of
+        its table when requested."""
+        system, workloads = system_wl_four_two_apps
+        problem = Problem(system=system, workloads=workloads)
+        sol = SimpleCostAllocator(problem=problem).solve()
+
+        printer = SolutionPrettyPrinter(sol)
+        app = system.apps[0]
+        table = printer.get_table_app(app, detail_regions=False)
+        table_skip = printer.get_table_app(
+            app, detail_regions=False, skip_empty_slots=True
+        )
+
+        # Time slot 3 has no workload, so its "total" row is left out
+        assert table_skip.row_count == table.row_count - 1
+
     @pytest.mark.parametrize("system_wl_four_two_apps", [0.2], indirect=True)
     def test_compute_alloc_time_slot(self, system_wl_four_two_apps: float):
         """Test the compute_alloc_time_slot method for the first time slot."""